@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+'''measure startup cost of every console script in oxenfree.bin
+
+For each script reports:
+- import: total import time of the module, from `python -X importtime`
+- --help: median wall time of `python -m oxenfree.bin.<script> --help`
+- heaviest modules imported directly by oxenfree code, to see what should be deferred
+'''
+
+import pkgutil
+import statistics
+import subprocess
+import sys
+import time
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import oxenfree.bin
+
+
+@dataclass
+class Args:
+    repeat: int
+    top: int
+
+
+def parse_args() -> Args:
+    p = ArgumentParser(description='measure startup time of oxenfree console scripts')
+    p.add_argument('--repeat', type=int, default=5,
+        help='how many times to run each script with --help')
+    p.add_argument('--top', type=int, default=3,
+        help='how many heaviest imports to show per script')
+    return Args(**p.parse_args().__dict__)
+
+
+def main(args: Args) -> None:
+    baseline = measure_wall(['-c', 'pass'], args.repeat)
+    print(f'interpreter baseline: {baseline * 1000:.0f} ms')
+    for script in list_scripts():
+        module = f'oxenfree.bin.{script}'
+        try:
+            total_us, imports = measure_imports(module)
+        except RuntimeError as e:
+            print(f'{script}: import failed: {e}')
+            continue
+        wall = measure_wall(['-m', module, '--help'], args.repeat)
+        print(f'{script}: import {total_us / 1000:.0f} ms, --help {wall * 1000:.0f} ms')
+        for us, name in sorted(imports, reverse=True)[:args.top]:
+            print(f'    {us / 1000:6.1f} ms  {name}')
+
+
+def list_scripts() -> List[str]:
+    return sorted(m.name for m in pkgutil.iter_modules(oxenfree.bin.__path__))
+
+
+def measure_imports(module: str) -> Tuple[int, List[Tuple[int, str]]]:
+    '''total import time of module in microseconds, and cumulative import time of every
+    non-oxenfree module imported directly by oxenfree code'''
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        errors = proc.stderr.strip().splitlines()
+        raise RuntimeError(errors[-1] if errors else f'import {module} exited with {proc.returncode}')
+    total = 0
+    result = []
+    # importtime prints children before parents, reversed output goes parents first
+    stack: List[str] = []
+    for line in reversed(proc.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # one leading space, then two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        del stack[depth:]
+        stack.append(name)
+        if name == module:
+            total = int(cumulative)
+        parents = stack[:-1]
+        if not _is_own(name) and parents and all(_is_own(x) for x in parents):
+            result.append((int(cumulative), name))
+    return total, result
+
+
+def _is_own(name: str) -> bool:
+    return name == 'oxenfree' or name.startswith('oxenfree.')
+
+
+def measure_wall(python_args: List[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *python_args], capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -14,8 +14,12 @@ setuptools.setup(
         console_scripts=[
             'analyze_jsons = oxenfree.bin.analyze_jsons:_main',
             'autotranslate_jsons = oxenfree.bin.autotranslate_jsons:_main',
+            'merge_jsons = oxenfree.bin.merge_jsons:_main',
             'prepare_jsons = oxenfree.bin.prepare_jsons:_main',
             'repack_bundle = oxenfree.bin.repack_bundle:_main',
+            'snapshot_jsons = oxenfree.bin.snapshot_jsons:_main',
+            'suggest_jsons = oxenfree.bin.suggest_jsons:_main',
+            'validate_jsons = oxenfree.bin.validate_jsons:_main',
             'unpack_bundle = oxenfree.bin.unpack_bundle:_main',
         ]
     ),
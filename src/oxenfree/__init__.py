@@ -1,11 +1,15 @@
+from collections import OrderedDict
 from copy import copy
 import json
 import logging
 import os
+import re
 
 from dataclasses import dataclass, is_dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, MutableMapping, Optional, Tuple
+
+from oxenfree.strings import StringPool
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,9 @@ class TranslationEntry:
     verified: bool
     uk: str
 
+# text fields of TranslationEntry that repeat a lot across scenes
+_POOLED_FIELDS = ('en', 'ru_native', 'ru_machine', 'ru_final', 'uk')
+
 @dataclass
 class TranslationScene:
     bundle: str
@@ -27,11 +34,14 @@ class TranslationScene:
     entries: List[TranslationEntry]
 
     @staticmethod
-    def load_from_file(filename: Path) -> 'TranslationScene':
+    def load_from_file(filename: Path, pool: Optional[StringPool] = None) -> 'TranslationScene':
         with filename.open(encoding='utf-8') as f:
             data = json.load(f)
         ts = TranslationScene(bundle=data['bundle'], scene=data['scene'], entries=[])
         for e in data['entries']:
+            if pool is not None:
+                for key in _POOLED_FIELDS:
+                    e[key] = pool.canonical(e[key])
             ts.entries.append(TranslationEntry(**e))
         return ts
 
@@ -59,13 +69,156 @@ class _SceneEncoder(json.JSONEncoder):
         return super().default(o)
 
 
-TranslationMap = Dict[str, TranslationScene]
+TranslationMap = MutableMapping[str, TranslationScene]
+
+def load_translation_map_from_dir(dirname: Path, pool: Optional[StringPool] = None) -> TranslationMap:
+    '''with pool given, equal texts of all scenes share one string instance'''
+    result: TranslationMap = dict()
+    for key, child in _list_scene_files(dirname):
+        result[key] = TranslationScene.load_from_file(child, pool)
+    return result
+
+
+_SNAPSHOT_VERSION = 1
 
-def load_translation_map_from_dir(dirname: Path) -> TranslationMap:
+def save_translation_map_snapshot(trans_map: TranslationMap, filename: Path) -> StringPool:
+    '''dump whole map into one JSON file, where every unique text is stored once.
+
+    Entries are lists [tag, en, ru_native, ru_machine, ru_final, verified, uk] with
+    texts replaced by their index in the `strings` list.
+    '''
+    pool = StringPool()
+    scenes = []
+    for key in sorted(trans_map):
+        scene = trans_map[key]
+        entries = []
+        for e in sorted(scene.entries, key=lambda x: x.tag):
+            ids = [pool.intern(getattr(e, k)) for k in _POOLED_FIELDS]
+            en, ru_native, ru_machine, ru_final, uk = ids
+            entries.append([e.tag, en, ru_native, ru_machine, ru_final, e.verified, uk])
+        scenes.append({'bundle': scene.bundle, 'scene': scene.scene, 'entries': entries})
+    with filename.open('w', encoding='utf-8') as f:
+        json.dump(
+            {'version': _SNAPSHOT_VERSION, 'strings': pool.strings, 'scenes': scenes},
+            f,
+            ensure_ascii=False,
+            separators=(',', ':'),
+        )
+    return pool
+
+
+def load_translation_map_snapshot(filename: Path, pool: Optional[StringPool] = None) -> TranslationMap:
+    '''read file written by save_translation_map_snapshot'''
+    with filename.open(encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != _SNAPSHOT_VERSION:
+        raise RuntimeError(f'{filename}: unsupported snapshot version {data.get("version")}')
+    strings = data['strings']
+    if pool is not None:
+        strings = [pool.canonical(x) for x in strings]
     result: TranslationMap = dict()
+    for sc in data['scenes']:
+        ts = TranslationScene(bundle=sc['bundle'], scene=sc['scene'], entries=[])
+        for tag, en, ru_native, ru_machine, ru_final, verified, uk in sc['entries']:
+            ts.entries.append(TranslationEntry(
+                tag=tag,
+                en=strings[en],
+                ru_native=strings[ru_native],
+                ru_machine=strings[ru_machine],
+                ru_final=strings[ru_final],
+                verified=verified,
+                uk=strings[uk],
+            ))
+        result[ts.scene] = ts
+    return result
+
+
+def _list_scene_files(dirname: Path) -> Iterator[Tuple[str, Path]]:
     for child in dirname.iterdir():
         if not (child.is_file() and child.name.endswith('.json')):
             continue
         key, _ = os.path.splitext(child.name)
-        result[key] = TranslationScene.load_from_file(child)
-    return result
+        yield key, child
+
+
+# save_to_file writes bundle as the first field, so it is found without parsing whole file
+_BUNDLE_RE = re.compile(r'"bundle":\s*"([^"]*)"')
+_BUNDLE_PEEK_SIZE = 256
+
+
+class LazyTranslationMap(MutableMapping[str, TranslationScene]):
+    '''TranslationMap that lists scene keys from directory and parses a scene on first access.
+
+    At most max_resident parsed scenes are kept; the least recently used one is dropped
+    and will be read from disk again on next access, so changes to a scene should be saved
+    before moving on to the others. Scenes assigned to the map are never dropped.
+    '''
+    def __init__(
+            self,
+            dirname: Path,
+            scene_prefixes: Iterable[str] = (),
+            bundles: Iterable[str] = (),
+            max_resident: Optional[int] = None,
+            pool: Optional[StringPool] = None,
+        ) -> None:
+        self._max_resident = max_resident
+        self._pool = pool
+        self._resident: 'OrderedDict[str, TranslationScene]' = OrderedDict()
+        self._assigned: Dict[str, TranslationScene] = dict()
+        prefixes = tuple(scene_prefixes)
+        bundles = set(bundles)
+        self._files: Dict[str, Path] = dict()
+        for key, child in _list_scene_files(dirname):
+            if prefixes and not key.startswith(prefixes):
+                continue
+            if bundles and _peek_bundle(child) not in bundles:
+                continue
+            self._files[key] = child
+        logger.debug(f'lazy map: {len(self._files)} scenes found in {dirname}')
+
+    @property
+    def scene_files(self) -> Dict[str, Path]:
+        '''{scene key: JSON file} for scenes that come from the directory'''
+        return dict(self._files)
+
+    def __getitem__(self, key: str) -> TranslationScene:
+        if key in self._assigned:
+            return self._assigned[key]
+        if key in self._resident:
+            self._resident.move_to_end(key)
+            return self._resident[key]
+        scene = TranslationScene.load_from_file(self._files[key], self._pool)
+        self._resident[key] = scene
+        if self._max_resident is not None and len(self._resident) > self._max_resident:
+            dropped, _ = self._resident.popitem(last=False)
+            logger.debug(f'lazy map: drop {dropped}')
+        return scene
+
+    def __setitem__(self, key: str, scene: TranslationScene) -> None:
+        self._resident.pop(key, None)
+        self._assigned[key] = scene
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._files.pop(key, None)
+        self._resident.pop(key, None)
+        self._assigned.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._assigned or key in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._files
+        yield from (key for key in self._assigned if key not in self._files)
+
+    def __len__(self) -> int:
+        return len(self._files) + sum(1 for key in self._assigned if key not in self._files)
+
+
+def _peek_bundle(filename: Path) -> str:
+    with filename.open(encoding='utf-8') as f:
+        m = _BUNDLE_RE.search(f.read(_BUNDLE_PEEK_SIZE))
+    if m:
+        return m.group(1)
+    return TranslationScene.load_from_file(filename).bundle
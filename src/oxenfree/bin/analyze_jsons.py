@@ -12,6 +12,7 @@ from oxenfree import (
     TranslationMap,
     load_translation_map_from_dir,
 )
+from oxenfree.strings import StringPool
 
 logger = logging.getLogger(__name__)
 
@@ -79,7 +80,7 @@ def main(args: Args) -> None:
 
 def get_translation_map(translations_dir: Path) -> TranslationMap:
     logger.info('loading translation JSONs...')
-    result = load_translation_map_from_dir(translations_dir)
+    result = load_translation_map_from_dir(translations_dir, StringPool())
     logger.info('loading JSONs done')
     return result
 
@@ -7,15 +7,14 @@ import time
 from argparse import ArgumentParser
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
-
-import deepl
+from typing import Dict, List, Optional
 
 from oxenfree import (
+    LazyTranslationMap,
     TranslationEntry,
     TranslationMap,
-    load_translation_map_from_dir,
 )
+from oxenfree.shard import SHARD_BY_HASH, SHARD_MODES, Shard, apply_shard, parse_shard
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +25,9 @@ class Args:
     dialogue_bundle: bool
     translations_dir: Path
     output_dir: Path
+    scenes: Optional[List[str]]
+    shard: Optional[Shard]
+    shard_by: str
 
 
 def parse_args() -> Args:
@@ -37,6 +39,17 @@ def parse_args() -> Args:
         help='where to save updated JSONs')
     p.add_argument('--dialogue-bundle', action='store_true',
         help='translate even contents of dialogue_packages_assets_all, even though it is broken')
+    p.add_argument('--scenes', nargs='+',
+        help='translate only scenes which names start with any of given prefixes, like A1JC or A1JC.ANSPHO')
+    p.add_argument('--shard', type=parse_shard,
+        help='i/N - translate only i-th of N parts of scenes, to run on several machines;'
+            ' merge results with merge_jsons')
+    p.add_argument('--shard-by', choices=SHARD_MODES, default=SHARD_BY_HASH,
+        help='how to split scenes into shards\n'
+        'hash - by hash of scene name; scene stays in its shard when others are added\n'
+        'entries - balance number of all entries, translated or not, between shards\n'
+        'untranslated - balance number of entries that still need machine translation;'
+        ' follows DeepL usage, not the time spent on loading and saving scenes\n')
     p.add_argument('--debug', action='store_true',
         help='print more logs')
     return Args(**p.parse_args().__dict__)
@@ -50,21 +63,25 @@ def main(args: Args) -> None:
     # silence verbose logger from deepl
     logging.getLogger('urllib3.connectionpool').setLevel(logging.INFO)
 
-    translation = get_translation_map(args.translations_dir)
-    run_machine_translation(translation, args.output_dir, args.dialogue_bundle)
+    translation = get_translation_map(args.translations_dir, args.scenes or [], args.dialogue_bundle)
+    if args.shard:
+        apply_shard(translation, args.shard, args.shard_by)
+    run_machine_translation(translation, args.output_dir)
 
 
-def get_translation_map(translations_dir: Path) -> TranslationMap:
-    logger.info('loading translation JSONs...')
-    result = load_translation_map_from_dir(translations_dir)
-    logger.info('loading JSONs done')
+def get_translation_map(
+        translations_dir: Path, scene_prefixes: List[str],
+        dialogue_bundle_too: bool
+    ) -> LazyTranslationMap:
+    logger.info('listing translation JSONs...')
+    bundles = [] if dialogue_bundle_too else ['loc_packages_assets_']
+    # every scene is translated and saved right away, no need to keep them all in memory
+    result = LazyTranslationMap(translations_dir, scene_prefixes, bundles, max_resident=16)
+    logger.info(f'listing JSONs done, {len(result)} scenes to translate')
     return result
 
 
-def run_machine_translation(
-        trans_map: TranslationMap, output_dir: Path,
-        dialogue_bundle_too: bool
-    ) -> None:
+def run_machine_translation(trans_map: TranslationMap, output_dir: Path) -> None:
     logger.info('running machine translation...')
 
     if output_dir.is_dir():
@@ -72,13 +89,18 @@ def run_machine_translation(
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # same barks and choice lines repeat across scenes; translate every text only once
+    translated: Dict[str, str] = dict()
     for scene_key, scene in trans_map.items():
-        translate_scene_entries(scene.entries)
+        translate_scene_entries(scene.entries, translated)
         scene.save_to_file(output_dir)
     logger.info('translating done')
 
 
-def translate_scene_entries(entries: List[TranslationEntry]) -> None:
+def translate_scene_entries(entries: List[TranslationEntry], translated: Dict[str, str]) -> None:
+    # imported here to keep --help and startup fast
+    import deepl
+
     for e in entries:
         logger.debug(f'translate: {e.tag}')
         if e.ru_machine or e.ru_native or e.ru_final:
@@ -87,6 +109,10 @@ def translate_scene_entries(entries: List[TranslationEntry]) -> None:
         if not e.en:
             logger.warning(f'translate: no en text for tag {e.tag}')
             continue
+        if e.en in translated:
+            e.ru_machine = translated[e.en]
+            logger.debug(f'translate: already translated: {e.ru_machine}')
+            continue
         def trans() -> str:
             return 'D/ ' + deepl.translate(
                 source_language='EN',
@@ -101,6 +127,7 @@ def translate_scene_entries(entries: List[TranslationEntry]) -> None:
             logger.info('sleep 30 seconds and hope for the best...')
             time.sleep(30)
             e.ru_machine = trans()
+        translated[e.en] = e.ru_machine
         logger.debug(f'translate: result: {e.ru_machine}')
 
 
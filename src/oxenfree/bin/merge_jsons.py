@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import logging
+import shutil
+
+from argparse import ArgumentParser
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from oxenfree import (
+    TranslationEntry,
+    TranslationMap,
+    load_translation_map_from_dir,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Args:
+    debug: bool
+    inputs: List[Path]
+    base: Optional[Path]
+    output_dir: Path
+    force: bool
+
+
+def parse_args() -> Args:
+    p = ArgumentParser(description='merge JSON folders, produced by sharded runs of autotranslate_jsons,'
+        ' into one translation folder')
+    p.add_argument('--inputs', required=True, type=Path, nargs='+',
+        help='folders with translation JSONs to merge')
+    p.add_argument('--base', type=Path,
+        help='folder with the whole translation, like the one shards were made from; inputs'
+            ' override its entries without conflicts, and its other scenes are kept as is')
+    p.add_argument('--output-dir', type=Path, default='output/merge_jsons/',
+        help='where to put merged JSONs')
+    p.add_argument('--force', action='store_true',
+        help='on conflict between inputs, keep entry from the folder listed first instead of failing')
+    p.add_argument('--debug', action='store_true',
+        help='print more logs')
+    return Args(**p.parse_args().__dict__)
+
+
+def main(args: Args) -> None:
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    merged: TranslationMap = dict()
+    conflicts = 0
+    for input_dir in args.inputs:
+        logger.info(f'loading translation JSONs from {input_dir}...')
+        conflicts += merge_into(merged, load_translation_map_from_dir(input_dir), input_dir)
+    logger.info(f'merged {len(merged)} scenes')
+
+    if conflicts and not args.force:
+        logger.critical(f'merge: {conflicts} conflicts found; use --force to keep first versions')
+        raise RuntimeError('merge conflicts')
+    if args.base:
+        logger.info(f'loading base translation JSONs from {args.base}...')
+        base = load_translation_map_from_dir(args.base)
+        override(base, merged)
+        merged = base
+        logger.info(f'{len(merged)} scenes with base')
+    dump_map(merged, args.output_dir)
+
+
+def merge_into(result: TranslationMap, other: TranslationMap, source: Path) -> int:
+    '''add scenes and entries of other into result; returns number of conflicts.
+
+    Same scene may come from several folders as long as its entries do not contradict
+    each other; on conflict entry from result is kept.
+    '''
+    conflicts = 0
+    for key, scene in other.items():
+        existing = result.get(key)
+        if existing is None:
+            result[key] = scene
+            continue
+        if existing.bundle != scene.bundle:
+            logger.error(f'merge: {source}: scene {key} is in {scene.bundle},'
+                f' but was in {existing.bundle} before')
+            conflicts += 1
+            continue
+        entries: Dict[str, TranslationEntry] = {e.tag: e for e in existing.entries}
+        for e in scene.entries:
+            old = entries.get(e.tag)
+            if old is None:
+                existing.entries.append(e)
+            elif old != e:
+                diff = [f.name for f in fields(e) if getattr(e, f.name) != getattr(old, f.name)]
+                logger.error(f'merge: {source}: {e.tag} differs in {", ".join(diff)}')
+                conflicts += 1
+    return conflicts
+
+
+def override(base: TranslationMap, other: TranslationMap) -> None:
+    '''replace scenes and entries of base with ones from other, keeping order of base entries'''
+    for key, scene in other.items():
+        existing = base.get(key)
+        if existing is None or existing.bundle != scene.bundle:
+            if existing is not None:
+                logger.warning(f'merge: scene {key} moved from {existing.bundle} to {scene.bundle}')
+            base[key] = scene
+            continue
+        entries: Dict[str, TranslationEntry] = {e.tag: e for e in scene.entries}
+        existing.entries = [entries.pop(e.tag, e) for e in existing.entries]
+        existing.entries.extend(entries.values())
+
+
+def dump_map(trans_map: TranslationMap, output_dir: Path) -> None:
+    logger.info(f'saving translation map into {output_dir.absolute()}')
+    if output_dir.is_dir():
+        logger.info(f'directory {output_dir} exists; cleanup')
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for scene in trans_map.values():
+        scene.save_to_file(output_dir)
+    logger.info('saving done')
+
+
+def _main() -> None:
+    main(parse_args())
+
+
+if __name__ == '__main__':
+    _main()
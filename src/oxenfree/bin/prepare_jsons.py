@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import csv
+import gzip
 import shutil
 import logging
 
@@ -7,7 +8,7 @@ from argparse import ArgumentParser
 from copy import deepcopy
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, TextIO
 
 from oxenfree import (
     TranslationEntry,
@@ -162,13 +163,22 @@ def read_csv_lines(filepath: Path) -> Iterable[List[str]]:
     if not filepath.is_file():
         raise RuntimeError(f'{filepath} is not a file')
 
-    with filepath.open(encoding='utf-8') as f:
+    if _is_gzip(filepath):
+        f: TextIO = gzip.open(filepath, 'rt', encoding='utf-8')
+    else:
+        f = filepath.open(encoding='utf-8')
+
+    with f:
         reader = csv.reader(f, delimiter='\t')
 
         for line in reader:
             yield line
 
 
+def _is_gzip(filepath: Path) -> bool:
+    return filepath.suffix == '.gz'
+
+
 def _validate_headers(row: List[str], headers: List[str], f: Path) -> None:
     if len(row) != len(headers):
         logger.critical(f'unpack: {f} - expected {len(headers)} columns, but got {len(row)}')
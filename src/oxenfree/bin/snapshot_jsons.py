@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import logging
+import shutil
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+
+from oxenfree import (
+    TranslationMap,
+    load_translation_map_from_dir,
+    save_translation_map_snapshot,
+)
+from oxenfree.strings import StringPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Args:
+    debug: bool
+    translations_dir: Path
+    output_dir: Path
+
+
+def parse_args() -> Args:
+    p = ArgumentParser(description='pack all translation JSONs into a single snapshot file,'
+        ' where every unique text is stored once')
+    p.add_argument('--translations-dir', required=True, type=Path,
+        help='path to load translation JSONs from')
+    p.add_argument('--output-dir', type=Path, default='output/snapshot_jsons/',
+        help='where to put translations.json snapshot')
+    p.add_argument('--debug', action='store_true',
+        help='print more logs')
+    return Args(**p.parse_args().__dict__)
+
+
+def main(args: Args) -> None:
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    translation = get_translation_map(args.translations_dir)
+
+    if args.output_dir.is_dir():
+        logger.info(f'directory {args.output_dir} exists; cleanup')
+        shutil.rmtree(args.output_dir)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    snapshot = args.output_dir / 'translations.json'
+    logger.info(f'saving snapshot to {snapshot.absolute()}')
+    pool = save_translation_map_snapshot(translation, snapshot)
+
+    print(f'Сцен: {len(translation)}')
+    print(f'Текстов: {pool.interned}, уникальных: {len(pool)}')
+    print(f'Размер снапшота: {snapshot.stat().st_size} байт')
+
+
+def get_translation_map(translations_dir: Path) -> TranslationMap:
+    logger.info('loading translation JSONs...')
+    result = load_translation_map_from_dir(translations_dir, StringPool())
+    logger.info('loading JSONs done')
+    return result
+
+
+def _main() -> None:
+    main(parse_args())
+
+
+if __name__ == '__main__':
+    _main()
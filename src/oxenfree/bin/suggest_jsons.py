@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import logging
+import shutil
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from oxenfree import (
+    TranslationMap,
+    load_translation_map_from_dir,
+)
+from oxenfree.strings import StringPool
+from oxenfree.suggest import Suggestion, suggest_translations
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Args:
+    debug: bool
+    translations_dir: Path
+    output_dir: Path
+    threshold: float
+    list_suggestions: bool
+
+
+def parse_args() -> Args:
+    p = ArgumentParser(description='fill ru_machine of untranslated entries with existing translations'
+        ' of similar english lines; meant to run before autotranslate_jsons to save on DeepL calls')
+    p.add_argument('--translations-dir', required=True, type=Path,
+        help='path to load translation JSONs from')
+    p.add_argument('--output-dir', type=Path, default='output/suggest_jsons/',
+        help='where to save updated JSONs')
+    p.add_argument('--threshold', type=float, default=0.7,
+        help='minimal similarity (jaccard over char 3-grams) of english texts, from 0 to 1')
+    p.add_argument('--list-suggestions', action='store_true',
+        help='print suggestions instead of saving JSONs')
+    p.add_argument('--debug', action='store_true',
+        help='print more logs')
+    return Args(**p.parse_args().__dict__)
+
+
+def main(args: Args) -> None:
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    translation = get_translation_map(args.translations_dir)
+    suggestions = suggest_translations(translation, args.threshold)
+    if args.list_suggestions:
+        print_suggestions(suggestions)
+        return
+    apply_suggestions(translation, suggestions)
+    dump_map(translation, args.output_dir)
+
+
+def get_translation_map(translations_dir: Path) -> TranslationMap:
+    logger.info('loading translation JSONs...')
+    result = load_translation_map_from_dir(translations_dir, StringPool())
+    logger.info('loading JSONs done')
+    return result
+
+
+def print_suggestions(suggestions: List[Suggestion]) -> None:
+    for s in suggestions:
+        print(f'{s.tag}\t{s.similarity:.2f}\t{s.source_tag}')
+        print(f'  en: {s.en}')
+        print(f'  tm: {s.source_en}')
+        print(f'  ru: {s.ru_final}')
+
+
+def apply_suggestions(trans_map: TranslationMap, suggestions: List[Suggestion]) -> None:
+    by_tag: Dict[str, Suggestion] = {s.tag: s for s in suggestions}
+    for scene in trans_map.values():
+        for e in scene.entries:
+            s = by_tag.get(e.tag)
+            if s:
+                # prefixed like DeepL results, so translators know it needs a review
+                e.ru_machine = 'TM/ ' + s.ru_final
+
+
+def dump_map(trans_map: TranslationMap, output_dir: Path) -> None:
+    logger.info(f'saving translation map into {output_dir.absolute()}')
+    if output_dir.is_dir():
+        logger.info(f'directory {output_dir} exists; cleanup')
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for scene in trans_map.values():
+        scene.save_to_file(output_dir)
+    logger.info('saving done')
+
+
+def _main() -> None:
+    main(parse_args())
+
+
+if __name__ == '__main__':
+    _main()
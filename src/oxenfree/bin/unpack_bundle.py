@@ -1,23 +1,23 @@
 #!/usr/bin/env python3
 
 import csv
+import gzip
 import logging
 import os
 import shutil
+import tempfile
 
 from argparse import ArgumentParser
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
-
-import UnityPy
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
 
 from oxenfree.bundle import detect_bundle_dir, get_text_tree
+from oxenfree.text_table import TextSpool, save_text_rows
 
 
 logger = logging.getLogger(__name__)
-if UnityPy.__version__ != '1.10.1':
-    logger.warning(f'UnityPy {UnityPy.__version__} detected, but only 1.9.10 was tested!')
 
 
 @dataclass
@@ -26,6 +26,9 @@ class Args:
     game_dir: Path
     output_dir: Path
     required_bundles: List[str]
+    all_languages: bool
+    stream: bool
+    compress: bool
 
 TextMap = Dict[str, Dict[str, str]]
 
@@ -39,6 +42,12 @@ def parse_args() -> Args:
         'dialogue_packages_assets_all',
         'loc_packages_assets_',
     ], help='.bundle files to be unpacked; if none - unpack everything')
+    p.add_argument('--all-languages', action='store_true',
+        help='also extract texts of every language into text_table.sqlite; implies --stream')
+    p.add_argument('--stream', action='store_true',
+        help='spool texts to a temporary file while reading bundles instead of keeping them in memory')
+    p.add_argument('--compress', action='store_true',
+        help='write text table as gzip-compressed text_table.csv.gz')
     p.add_argument('--debug', action='store_true',
         help='print more logs')
     return Args(**p.parse_args().__dict__)
@@ -48,8 +57,12 @@ def main(args: Args) -> None:
     logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
 
     bundles = get_bundles(args.game_dir, args.required_bundles)
-    text_map = upy_unpack_bundles(bundles)
-    dump_text_map(text_map, args.output_dir)
+    if args.stream or args.all_languages:
+        # other languages are several times larger than en/ru/uk; never keep them in memory
+        stream_bundles(bundles, args.output_dir, args.all_languages, args.compress)
+    else:
+        text_map = upy_unpack_bundles(bundles)
+        dump_text_map(text_map, args.output_dir, args.compress)
 
 
 def get_bundles(game_dir: Path, required_bundles: List[str]) -> Dict[str, Path]:
@@ -81,9 +94,17 @@ def file_is_valid_bundle(filename: Path, bundles: List[str]) -> bool:
     return name in bundles
 
 
-def upy_unpack_bundles(bundles: Dict[str, Path]) -> TextMap:
-    logger.info('unpacking bundles...')
-    text_map: TextMap = dict()
+def import_unitypy() -> ModuleType:
+    # heavy import, only done when bundles are actually read
+    import UnityPy
+    if UnityPy.__version__ != '1.10.1':
+        logger.warning(f'UnityPy {UnityPy.__version__} detected, but only 1.9.10 was tested!')
+    return UnityPy
+
+
+def iter_text_trees(bundles: Dict[str, Path]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    '''yields (bundle name, text tree) for every text MonoBehaviour in bundles'''
+    UnityPy = import_unitypy()
     for key, bundle in bundles.items():
         logger.info(f'loading bundle {key}...')
         env = UnityPy.load(str(bundle))
@@ -94,15 +115,61 @@ def upy_unpack_bundles(bundles: Dict[str, Path]) -> TextMap:
             tree = get_text_tree(obj)
             if not tree:
                 continue
-            fill_text_map(
-                tree,
-                os.path.splitext(bundle.name)[0],
-                text_map,
-            )
+            yield os.path.splitext(bundle.name)[0], tree
+
+
+def upy_unpack_bundles(bundles: Dict[str, Path]) -> TextMap:
+    logger.info('unpacking bundles...')
+    text_map: TextMap = dict()
+    for bundle_name, tree in iter_text_trees(bundles):
+        fill_text_map(tree, bundle_name, text_map)
     logger.info('unpacking done')
     return text_map
 
 
+def stream_bundles(
+        bundles: Dict[str, Path], output_dir: Path,
+        all_languages: bool, compress: bool
+    ) -> None:
+    logger.info('unpacking bundles, streaming...')
+    prepare_output_dir(output_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        spool = TextSpool(Path(tmp) / 'spool.sqlite')
+        try:
+            for bundle_name, tree in iter_text_trees(bundles):
+                lang = tree['_ietfTag']
+                if not all_languages and lang not in TEXT_TABLE_LANGUAGES:
+                    logger.debug(f'fill: skip {tree["m_Name"]}, useless language {lang}')
+                    continue
+                logger.debug(f'fill: {tree["m_Name"]}, language {lang}')
+                spool.add(
+                    bundle_name,
+                    lang,
+                    ((e['_entryName'], e['_localization']) for e in tree['_database']['_entries']),
+                )
+            logger.info('unpacking done')
+
+            with open_text_table(output_dir, compress) as f:
+                writer = csv.writer(f, delimiter='\t')
+                writer.writerow(TEXT_TABLE_HEADER)
+                for tag, bundle, texts in spool.rows(TEXT_TABLE_LANGUAGES):
+                    writer.writerow(text_table_line(tag, bundle, texts))
+            logger.info('writing done')
+
+            if all_languages:
+                langs = spool.languages()
+                db_file = output_dir / 'text_table.sqlite'
+                logger.info(f'writing {len(langs)} languages to {db_file}...')
+                save_text_rows(
+                    db_file,
+                    langs,
+                    ((tag, bundle, [texts.get(x) for x in langs]) for tag, bundle, texts in spool.rows()),
+                )
+                logger.info('writing done')
+        finally:
+            spool.close()
+
+
 _fill_order = 0
 def fill_text_map(tree: Dict[str, Any], bundle: str, text_map: TextMap) -> None:
     global _fill_order
@@ -127,29 +194,47 @@ def fill_text_map(tree: Dict[str, Any], bundle: str, text_map: TextMap) -> None:
         tm['_order'] = _fill_order
 
 
-def dump_text_map(text_map: TextMap, output_dir: Path) -> None:
-    csv_file = output_dir / 'text_table.csv'
-    logger.info(f'writing text table to {csv_file}...')
+TEXT_TABLE_HEADER = ['tag', 'bundle', 'en', 'ru', 'uk']
+TEXT_TABLE_LANGUAGES = ['en', 'ru', 'uk']
+
+def text_table_line(tag: str, bundle: str, texts: Dict[str, str]) -> List[str]:
+    return [
+        tag,
+        bundle,
+        texts.get('en', '<no-en-text>'),
+        texts.get('ru', ''),
+        texts.get('uk', '<no-uk-text>'),
+    ]
+
+
+def prepare_output_dir(output_dir: Path) -> None:
     if output_dir.is_dir():
         logger.info(f'directory {output_dir} exists; cleanup')
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    with csv_file.open('w', encoding='utf-8', newline='\n') as f:
+
+
+def open_text_table(output_dir: Path, compress: bool) -> TextIO:
+    if compress:
+        csv_file = output_dir / 'text_table.csv.gz'
+        logger.info(f'writing text table to {csv_file}...')
+        return gzip.open(csv_file, 'wt', encoding='utf-8', newline='\n')
+    csv_file = output_dir / 'text_table.csv'
+    logger.info(f'writing text table to {csv_file}...')
+    return csv_file.open('w', encoding='utf-8', newline='\n')
+
+
+def dump_text_map(text_map: TextMap, output_dir: Path, compress: bool = False) -> None:
+    prepare_output_dir(output_dir)
+    with open_text_table(output_dir, compress) as f:
         writer = csv.writer(f, delimiter='\t')
-        writer.writerow(['tag', 'bundle', 'en', 'ru', 'uk'])
+        writer.writerow(TEXT_TABLE_HEADER)
 
         items = list(text_map.items())
         items.sort(key=lambda x: x[1]['_order'])
 
         for tag, data in items:
-            line = [
-                tag,
-                data['bundle'],
-                data.get('en', '<no-en-text>'),
-                data.get('ru', ''),
-                data.get('uk', '<no-uk-text>'),
-            ]
-            writer.writerow(line)
+            writer.writerow(text_table_line(tag, data['bundle'], data))
     logger.info('writing done')
 
 
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import sys
+
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from oxenfree import LazyTranslationMap
+from oxenfree.shard import SHARD_BY_ENTRIES, SHARD_BY_HASH, Shard, apply_shard, parse_shard
+from oxenfree.strings import StringPool
+from oxenfree.validate import Issue, count_errors, validate_scene_files, validate_translation_map
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Args:
+    debug: bool
+    translations_dir: Path
+    format: str
+    jobs: int
+    shard: Optional[Shard]
+    shard_by: str
+
+
+def parse_args() -> Args:
+    p = ArgumentParser(description='check translated entries for broken markup, placeholders, machine'
+        ' translation leftovers and choice stubs; exits with 1 if any error was found')
+    p.add_argument('--translations-dir', required=True, type=Path,
+        help='path to load translation JSONs from')
+    p.add_argument('--format', choices=['text', 'json'], default='text',
+        help='text - one issue per line, for humans\n'
+        'json - one JSON object per line, for CI and editor hooks\n')
+    p.add_argument('--jobs', type=int, default=1,
+        help='how many processes to use for validation; pays off only for large directories')
+    p.add_argument('--shard', type=parse_shard,
+        help='i/N - validate only i-th of N parts of scenes, to run on several machines')
+    p.add_argument('--shard-by', choices=[SHARD_BY_HASH, SHARD_BY_ENTRIES], default=SHARD_BY_HASH,
+        help='how to split scenes into shards\n'
+        'hash - by hash of scene name\n'
+        'entries - balance number of entries between shards\n')
+    p.add_argument('--debug', action='store_true',
+        help='print more logs')
+    return Args(**p.parse_args().__dict__)
+
+
+def main(args: Args) -> int:
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    translation = get_translation_map(args.translations_dir)
+    if args.shard:
+        apply_shard(translation, args.shard, args.shard_by)
+    logger.info('validating translations...')
+    if args.jobs > 1:
+        issues = validate_scene_files(translation.scene_files, args.jobs)
+    else:
+        issues = validate_translation_map(translation)
+    errors = count_errors(issues)
+    logger.info(f'validating done: {errors} errors, {len(issues) - errors} warnings')
+    print_issues(issues, args.format)
+    return 1 if errors else 0
+
+
+def get_translation_map(translations_dir: Path) -> LazyTranslationMap:
+    logger.info('listing translation JSONs...')
+    # scenes are parsed when validation gets to them, so sharded runs read only their own
+    result = LazyTranslationMap(translations_dir, pool=StringPool())
+    logger.info(f'listing JSONs done, {len(result)} scenes found')
+    return result
+
+
+def print_issues(issues: List[Issue], format: str) -> None:
+    for x in issues:
+        if format == 'json':
+            print(json.dumps(asdict(x), ensure_ascii=False))
+        else:
+            print(f'{x.severity}: {x.tag}: {x.check}: {x.message}')
+
+
+def _main() -> None:
+    sys.exit(main(parse_args()))
+
+
+if __name__ == '__main__':
+    _main()
@@ -1,14 +1,17 @@
 import logging
 from pathlib import Path
 
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from UnityPy.files import ObjectReader
+if TYPE_CHECKING:
+    # UnityPy drags image, audio and texture codecs along; scripts that only need
+    # detect_bundle_dir should not pay for that
+    from UnityPy.files import ObjectReader
 
 logger = logging.getLogger(__name__)
 
 
-def get_text_tree(obj: ObjectReader) -> Optional[Dict[str, Any]]:
+def get_text_tree(obj: 'ObjectReader') -> Optional[Dict[str, Any]]:
     if obj.type.name != 'MonoBehaviour':
         return None
     if not obj.serialized_type.nodes:
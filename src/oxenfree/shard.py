@@ -0,0 +1,103 @@
+import json
+import logging
+import zlib
+
+from argparse import ArgumentTypeError
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+from oxenfree import LazyTranslationMap
+
+logger = logging.getLogger(__name__)
+
+SHARD_BY_HASH = 'hash'
+SHARD_BY_ENTRIES = 'entries'
+SHARD_BY_UNTRANSLATED = 'untranslated'
+SHARD_MODES: List[str] = [SHARD_BY_HASH, SHARD_BY_ENTRIES, SHARD_BY_UNTRANSLATED]
+
+
+@dataclass
+class Shard:
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f'{self.index}/{self.count}'
+
+
+def parse_shard(value: str) -> Shard:
+    '''argparse type for `i/N`, where 0 <= i < N
+
+    >>> parse_shard('1/4')
+    Shard(index=1, count=4)
+    '''
+    try:
+        index, count = (int(x) for x in value.split('/'))
+    except ValueError:
+        raise ArgumentTypeError(f'shard should look like i/N, got {value}')
+    if not 0 <= index < count:
+        raise ArgumentTypeError(f'shard index should be in [0, {count}), got {index}')
+    return Shard(index, count)
+
+
+def shard_by_hash(keys: Iterable[str], shard: Shard) -> Set[str]:
+    '''scene keys of the shard; crc32 does not depend on PYTHONHASHSEED, unlike hash()'''
+    return set(k for k in keys if zlib.crc32(k.encode('utf-8')) % shard.count == shard.index)
+
+
+def shard_by_weight(weights: Dict[str, int], shard: Shard) -> Set[str]:
+    '''scene keys of the shard, balancing total weight over shards.
+
+    Heaviest scenes go first to the least loaded shard, or to the one with fewer scenes if
+    loads are equal, so scenes of zero weight are spread evenly too. Remaining ties are
+    broken by key and shard index, so every worker computes the same split independently.
+    '''
+    loads = [0] * shard.count
+    sizes = [0] * shard.count
+    result: Set[str] = set()
+    for key in sorted(weights, key=lambda k: (-weights[k], k)):
+        target = min(range(shard.count), key=lambda i: (loads[i], sizes[i], i))
+        loads[target] += weights[key]
+        sizes[target] += 1
+        if target == shard.index:
+            result.add(key)
+    logger.debug(f'shard: loads {loads}')
+    return result
+
+
+def count_file_entries(filename: Path) -> int:
+    '''number of entries in translation JSON, without parsing it'''
+    return filename.read_bytes().count(b'"tag":')
+
+
+def count_untranslated_entries(filename: Path) -> int:
+    '''number of entries autotranslate_jsons would send to DeepL: english text, no russian one'''
+    data = json.loads(filename.read_bytes())
+    return sum(
+        1 for e in data['entries']
+        if e['en'] and not (e['ru_native'] or e['ru_machine'] or e['ru_final'])
+    )
+
+
+def apply_shard(trans_map: LazyTranslationMap, shard: Shard, by: str) -> None:
+    '''drop scenes of other shards from the map; nothing is parsed to do so'''
+    selected = select_shard(trans_map.scene_files, shard, by)
+    for key in [k for k in trans_map if k not in selected]:
+        del trans_map[key]
+
+
+def select_shard(files: Dict[str, Path], shard: Shard, by: str) -> Set[str]:
+    '''scene keys of the shard, out of {scene key: JSON file}'''
+    if by == SHARD_BY_HASH:
+        result = shard_by_hash(files, shard)
+    elif by == SHARD_BY_ENTRIES:
+        result = shard_by_weight({k: count_file_entries(f) for k, f in files.items()}, shard)
+    elif by == SHARD_BY_UNTRANSLATED:
+        result = shard_by_weight({k: count_untranslated_entries(f) for k, f in files.items()}, shard)
+    else:
+        # should not happen until someone f up with code
+        raise NotImplementedError(f'invalid shard mode {by}')
+    logger.info(f'shard {shard}: {len(result)} of {len(files)} scenes')
+    return result
+
@@ -0,0 +1,43 @@
+from typing import Dict, Iterable, List
+
+
+class StringPool:
+    '''stores every unique string once and refers to it by integer id.
+
+    Ids are assigned in order of first appearance, so a pool rebuilt from the same
+    strings in the same order gets the same ids.
+    '''
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        self._ids: Dict[str, int] = dict()
+        self._strings: List[str] = []
+        # number of intern calls, duplicates included
+        self.interned = 0
+        for s in strings:
+            self.intern(s)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, s: object) -> bool:
+        return s in self._ids
+
+    def intern(self, s: str) -> int:
+        '''id of s, adding it to the pool if needed'''
+        self.interned += 1
+        sid = self._ids.get(s)
+        if sid is None:
+            sid = len(self._strings)
+            self._ids[s] = sid
+            self._strings.append(s)
+        return sid
+
+    def canonical(self, s: str) -> str:
+        '''pooled instance equal to s; equal strings share memory after passing through this'''
+        return self._strings[self.intern(s)]
+
+    def get(self, sid: int) -> str:
+        return self._strings[sid]
+
+    @property
+    def strings(self) -> List[str]:
+        return self._strings
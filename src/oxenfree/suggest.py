@@ -0,0 +1,149 @@
+import logging
+import random
+import re
+import zlib
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from oxenfree import TranslationEntry, TranslationMap
+
+logger = logging.getLogger(__name__)
+
+# 20 bands of 3 rows: pairs with jaccard ~0.5 share at least one bucket with p ~0.93,
+# pairs with jaccard ~0.2 - with p ~0.15; candidates are re-checked with exact jaccard
+_BANDS = 20
+_ROWS = 3
+_WS_RE = re.compile(r'\s+')
+
+
+@dataclass
+class Suggestion:
+    tag: str
+    en: str
+    source_tag: str
+    source_en: str
+    ru_final: str
+    similarity: float
+
+
+def needs_translation(e: TranslationEntry) -> bool:
+    '''same criteria autotranslate_jsons uses to decide if entry should be sent to DeepL'''
+    return bool(e.en) and not (e.ru_machine or e.ru_native or e.ru_final)
+
+
+def shingles(text: str, n: int = 3) -> FrozenSet[str]:
+    '''>>> sorted(shingles('Hi!'))
+    [' hi', 'hi!', 'i! ']
+    '''
+    text = ' ' + _WS_RE.sub(' ', text.lower()).strip() + ' '
+    if len(text) <= n:
+        return frozenset([text])
+    return frozenset(text[i:i+n] for i in range(len(text) - n + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashIndex:
+    '''locality-sensitive index over char n-grams of english texts.
+
+    Lookup cost depends on the size of colliding buckets, not on the size of the corpus,
+    so matching every untranslated line against the memory stays sub-quadratic.
+    '''
+    def __init__(self, seed: int = 0x0E2) -> None:
+        rng = random.Random(seed)
+        # xor with random masks is a weak but cheap permutation family; it lets min() run
+        # over map() in C, which matters much more here than hash quality
+        self._masks = [rng.getrandbits(32) for _ in range(_BANDS * _ROWS)]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self._entries: List[TranslationEntry] = []
+        self._shingles: List[FrozenSet[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, sh: FrozenSet[str]) -> List[int]:
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in sh]
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def _bands(self, sh: FrozenSet[str]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        sig = self.signature(sh)
+        for band in range(_BANDS):
+            yield band, tuple(sig[band*_ROWS:(band+1)*_ROWS])
+
+    def add(self, entry: TranslationEntry) -> None:
+        idx = len(self._entries)
+        sh = shingles(entry.en)
+        self._entries.append(entry)
+        self._shingles.append(sh)
+        for key in self._bands(sh):
+            self._buckets[key].append(idx)
+
+    def query(self, text: str, threshold: float) -> List[Tuple[float, TranslationEntry]]:
+        '''returns indexed entries similar to text, best matches first'''
+        sh = shingles(text)
+        candidates: Set[int] = set()
+        for key in self._bands(sh):
+            candidates.update(self._buckets.get(key, ()))
+        result = []
+        for idx in candidates:
+            sim = jaccard(sh, self._shingles[idx])
+            if sim >= threshold:
+                result.append((sim, self._entries[idx]))
+        result.sort(key=lambda x: (-x[0], x[1].tag))
+        return result
+
+
+def build_memory_index(trans_map: TranslationMap) -> MinHashIndex:
+    '''index every entry with ru_final, verified ones first; identical en texts are indexed once'''
+    logger.info('building translation memory index...')
+    index = MinHashIndex()
+    seen: Set[str] = set()
+    memory = (
+        e
+        for scene_key in sorted(trans_map)
+        for e in trans_map[scene_key].entries
+        # choice stubs are verified automatically and would match nothing useful
+        if e.ru_final and e.en and 'DO NOT DELETE' not in e.en
+    )
+    for e in sorted(memory, key=lambda x: not x.verified):
+        if e.en in seen:
+            continue
+        seen.add(e.en)
+        index.add(e)
+    logger.info(f'indexed {len(index)} translated lines')
+    return index
+
+
+def suggest_translations(trans_map: TranslationMap, threshold: float) -> List[Suggestion]:
+    index = build_memory_index(trans_map)
+    logger.info('looking up suggestions...')
+    result: List[Suggestion] = []
+    # barks repeat a lot across scenes, look each unique text up only once
+    cache: Dict[str, List[Tuple[float, TranslationEntry]]] = dict()
+    for scene_key in sorted(trans_map):
+        for e in trans_map[scene_key].entries:
+            if not needs_translation(e):
+                continue
+            if e.en not in cache:
+                cache[e.en] = index.query(e.en, threshold)
+            matches = cache[e.en]
+            if not matches:
+                continue
+            sim, source = matches[0]
+            logger.debug(f'suggest: {e.tag} <- {source.tag} ({sim:.2f})')
+            result.append(Suggestion(
+                tag=e.tag,
+                en=e.en,
+                source_tag=source.tag,
+                source_en=source.en,
+                ru_final=source.ru_final,
+                similarity=sim,
+            ))
+    logger.info(f'found {len(result)} suggestions')
+    return result
@@ -0,0 +1,159 @@
+import json
+import logging
+import sqlite3
+
+from contextlib import closing
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TABLE = 'texts'
+
+
+@dataclass
+class TextColumns:
+    '''texts of every language found in bundles: one row per tag, one column per language.
+
+    Rows are ordered like TextSpool.rows over all languages; texts of other languages move
+    tags, so this is not necessarily the order of text_table.csv.
+    '''
+    tags: List[str] = field(default_factory=list)
+    bundles: List[str] = field(default_factory=list)
+    languages: Dict[str, List[Optional[str]]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+
+# (tag, bundle, texts in the order of languages)
+TextRow = Tuple[str, str, Iterable[Optional[str]]]
+
+def save_text_rows(filename: Path, langs: List[str], rows: Iterable[TextRow]) -> None:
+    '''write rows into a new sqlite table `texts`, indexed by tag; rows are consumed one by one'''
+    if filename.exists():
+        filename.unlink()
+    names = ['tag', 'bundle', 'ord'] + langs
+    with closing(sqlite3.connect(str(filename))) as db, db:
+        db.execute(
+            f'CREATE TABLE {_TABLE} (tag TEXT PRIMARY KEY, bundle TEXT NOT NULL, ord INTEGER NOT NULL'
+            + ''.join(f', {_quote(x)} TEXT' for x in langs)
+            + ')'
+        )
+        db.executemany(
+            f'INSERT INTO {_TABLE} ({", ".join(_quote(x) for x in names)})'
+            f' VALUES ({", ".join("?" * len(names))})',
+            ((tag, bundle, idx, *texts) for idx, (tag, bundle, texts) in enumerate(rows)),
+        )
+        db.execute(f'CREATE INDEX {_TABLE}_ord ON {_TABLE} (ord)')
+
+
+class TextSpool:
+    '''external-memory merge of texts coming from bundles one language object at a time.
+
+    Texts are appended to an sqlite file as they are read, so memory does not grow with
+    the number of bundles or languages. Merging follows fill_text_map of unpack_bundle:
+    the last text of a tag and language wins, a tag keeps the bundle it was seen last in,
+    and tags are ordered by the number of en entries read before their last text.
+    Repeated texts of a language are reported only on the first merge that includes it.
+    '''
+    def __init__(self, filename: Path) -> None:
+        self._db = sqlite3.connect(str(filename))
+        # nothing here has to survive a crash
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute(
+            'CREATE TABLE raw (seq INTEGER PRIMARY KEY, tag TEXT, bundle TEXT, lang TEXT,'
+            ' ord INTEGER, text TEXT)'
+        )
+        self._order = 0
+        self._indexed = False
+        # languages whose repeated texts were already reported
+        self._reported: Set[str] = set()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add(self, bundle: str, lang: str, entries: Iterable[Tuple[str, str]]) -> None:
+        '''append (tag, text) pairs of one language object'''
+        def rows() -> Iterator[Tuple[str, str, str, int, str]]:
+            for tag, text in entries:
+                if lang == 'en':
+                    self._order += 1
+                yield tag, bundle, lang, self._order, text
+        self._db.executemany('INSERT INTO raw (tag, bundle, lang, ord, text) VALUES (?, ?, ?, ?, ?)', rows())
+
+    def languages(self) -> List[str]:
+        return [row[0] for row in self._db.execute('SELECT DISTINCT lang FROM raw ORDER BY lang')]
+
+    def rows(self, languages: Optional[List[str]] = None) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        '''(tag, bundle, {lang: text}) for every tag, in the final order.
+
+        With languages given, texts of other languages are ignored as if they were never read.
+        '''
+        self._merge(languages)
+        for tag, bundle, texts in self._db.execute('SELECT tag, bundle, texts FROM merged ORDER BY ord, first_seq'):
+            yield tag, bundle, json.loads(texts)
+
+    def _merge(self, languages: Optional[List[str]]) -> None:
+        logger.debug(f'spool: merging texts by tag, languages: {languages or "all"}')
+        if not self._indexed:
+            self._db.execute('CREATE INDEX raw_tag ON raw (tag, seq)')
+            self._indexed = True
+        self._db.execute('DROP TABLE IF EXISTS merged')
+        self._db.execute(
+            'CREATE TABLE merged (first_seq INTEGER, ord INTEGER, tag TEXT, bundle TEXT, texts TEXT)'
+        )
+        query = 'SELECT seq, tag, bundle, lang, ord, text FROM raw'
+        params: List[str] = []
+        if languages is not None:
+            query += f' WHERE lang IN ({", ".join("?" * len(languages))})'
+            params = languages
+        query += ' ORDER BY tag, seq'
+        reported = set(self._reported)
+
+        def merged() -> Iterator[Tuple[int, int, str, str, str]]:
+            for tag, group in groupby(self._db.execute(query, params), key=itemgetter(1)):
+                texts: Dict[str, str] = dict()
+                first_seq = None
+                for seq, _, bundle, lang, order, text in group:
+                    if first_seq is None:
+                        first_seq = seq
+                    if texts.get(lang) and lang not in reported:
+                        logger.warning(f'fill: {tag}-{lang} already exists!!')
+                    texts[lang] = text
+                yield first_seq, order, tag, bundle, json.dumps(texts, ensure_ascii=False)
+        self._db.executemany('INSERT INTO merged VALUES (?, ?, ?, ?, ?)', merged())
+        self._reported.update(self.languages() if languages is None else languages)
+        self._db.execute('CREATE INDEX merged_ord ON merged (ord, first_seq)')
+
+
+def load_text_columns(filename: Path, languages: Optional[List[str]] = None) -> TextColumns:
+    '''read table written by save_text_rows; only given languages are read, if any'''
+    result = TextColumns()
+    with closing(sqlite3.connect(str(filename))) as db:
+        existing = [
+            row[1] for row in db.execute(f'PRAGMA table_info({_TABLE})')
+            if row[1] not in ('tag', 'bundle', 'ord')
+        ]
+        langs = [x for x in existing if languages is None or x in languages]
+        query = (
+            f'SELECT tag, bundle{"".join(", " + _quote(x) for x in langs)}'
+            f' FROM {_TABLE} ORDER BY ord'
+        )
+        rows = db.execute(query).fetchall()
+    if not rows:
+        return result
+    tags, bundles, *texts = zip(*rows)
+    result.tags = list(tags)
+    result.bundles = list(bundles)
+    result.languages = {lang: list(column) for lang, column in zip(langs, texts)}
+    return result
+
+
+def _quote(name: str) -> str:
+    '''language tags like zh-Hans are not valid sql identifiers'''
+    return '"' + name.replace('"', '""') + '"'
@@ -0,0 +1,140 @@
+import logging
+import re
+
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import accumulate, islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Pattern
+
+from oxenfree import TranslationMap, TranslationScene
+
+logger = logging.getLogger(__name__)
+
+# entries of a scene are checked as one joined string per field; NUL never occurs in game texts
+_SEP = '\x00'
+
+_MARKUP_RE = re.compile(r'<[^<>\x00]+>')
+_PLACEHOLDER_RE = re.compile(r'\{\d+\}')
+_MACHINE_PREFIX_RE = re.compile(r'(?:^|\x00)(?:D|TM)/ ')
+_STUB_RE = re.compile(r'DO NOT DELETE')
+# markup and stage directions like [sigh] do not count into text length
+_NON_TEXT_RE = re.compile(r'<[^<>\x00]+>|\[[^\[\]\x00]*\]')
+
+# ru/en length ratio bounds; ~0.2% of ru_native texts fall outside of them
+_MIN_LENGTH_RATIO = 0.4
+_MAX_LENGTH_RATIO = 2.5
+# ratio is meaningless for short barks
+_MIN_RATIO_EN_LENGTH = 20
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+
+@dataclass
+class Issue:
+    scene: str
+    tag: str
+    check: str
+    severity: str
+    message: str
+
+
+def validate_translation_map(trans_map: TranslationMap) -> List[Issue]:
+    '''compare en and ru_final of every translated entry; issues are sorted by scene'''
+    return [issue for key in sorted(trans_map) for issue in validate_scene(trans_map[key])]
+
+
+def validate_scene_files(files: Dict[str, Path], jobs: int) -> List[Issue]:
+    '''same as validate_translation_map, for {scene key: JSON file} spread over jobs processes.
+
+    Workers get file paths and parse scenes themselves: parsing is the expensive part, and
+    parsed scenes are too large to be sent to workers cheaply.
+    '''
+    paths = [files[key] for key in sorted(files)]
+    chunksize = max(1, len(paths) // (jobs * 4))
+    # multiprocessing is slow to import and not needed for serial runs
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(jobs) as pool:
+        per_scene = list(pool.map(validate_scene_file, paths, chunksize=chunksize))
+    return [issue for issues in per_scene for issue in issues]
+
+
+def validate_scene_file(filename: Path) -> List[Issue]:
+    return validate_scene(TranslationScene.load_from_file(filename))
+
+
+def validate_scene(scene: TranslationScene) -> List[Issue]:
+    tags = [e.tag for e in scene.entries]
+    en = [e.en for e in scene.entries]
+    ru = [e.ru_final for e in scene.entries]
+    result: List[Issue] = []
+
+    def issue(idx: int, check: str, severity: str, message: str) -> None:
+        result.append(Issue(scene.scene, tags[idx], check, severity, message))
+
+    en_joined = _SEP.join(en)
+    ru_joined = _SEP.join(ru)
+    en_starts = _starts(en)
+    ru_starts = _starts(ru)
+
+    for check, severity, regex in (
+            ('placeholders', SEVERITY_ERROR, _PLACEHOLDER_RE),
+            ('markup', SEVERITY_WARNING, _MARKUP_RE),
+        ):
+        en_found = _find_per_entry(regex, en_joined, en_starts)
+        ru_found = _find_per_entry(regex, ru_joined, ru_starts)
+        for idx in sorted(en_found.keys() | ru_found.keys()):
+            if not ru[idx]:
+                continue
+            expected = en_found.get(idx, Counter())
+            actual = ru_found.get(idx, Counter())
+            if expected != actual:
+                missing = sorted((expected - actual).elements())
+                extra = sorted((actual - expected).elements())
+                issue(idx, check, severity, f'missing {missing}, extra {extra}')
+
+    for m in _MACHINE_PREFIX_RE.finditer(ru_joined):
+        idx = bisect_right(ru_starts, m.end() - 1) - 1
+        issue(idx, 'machine_prefix', SEVERITY_ERROR, 'ru_final starts with machine translation prefix')
+
+    stubs = set(_find_per_entry(_STUB_RE, en_joined, en_starts))
+    stubs.update(_find_per_entry(_STUB_RE, ru_joined, ru_starts))
+    for idx in sorted(stubs):
+        if en[idx] != ru[idx]:
+            issue(idx, 'stub', SEVERITY_ERROR, 'choice stub must be identical in en and ru_final')
+
+    en_lengths = list(map(len, _NON_TEXT_RE.sub('', en_joined).split(_SEP)))
+    ru_lengths = list(map(len, _NON_TEXT_RE.sub('', ru_joined).split(_SEP)))
+    outliers = [
+        idx
+        for idx, (en_len, ru_len) in enumerate(zip(en_lengths, ru_lengths))
+        if ru_len and en_len >= _MIN_RATIO_EN_LENGTH
+        and not _MIN_LENGTH_RATIO <= ru_len / en_len <= _MAX_LENGTH_RATIO
+    ]
+    for idx in outliers:
+        ratio = ru_lengths[idx] / en_lengths[idx]
+        issue(idx, 'length_ratio', SEVERITY_WARNING, f'ru/en length ratio is {ratio:.2f}')
+
+    result.sort(key=lambda x: x.tag)
+    return result
+
+
+def _starts(column: List[str]) -> List[int]:
+    '''offsets of every column value in _SEP.join(column)'''
+    offsets = accumulate(map(len, column), lambda pos, length: pos + length + len(_SEP), initial=0)
+    return list(islice(offsets, len(column)))
+
+
+def _find_per_entry(regex: Pattern[str], joined: str, starts: List[int]) -> Dict[int, Counter]:
+    '''run regex once over the joined column; returns matches grouped by entry index'''
+    result: Dict[int, Counter] = dict()
+    for m in regex.finditer(joined):
+        idx = bisect_right(starts, m.start()) - 1
+        result.setdefault(idx, Counter())[m.group()] += 1
+    return result
+
+
+def count_errors(issues: Iterable[Issue]) -> int:
+    return sum(1 for x in issues if x.severity == SEVERITY_ERROR)
@@ -0,0 +1,50 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from oxenfree import TranslationEntry, TranslationScene, load_translation_map_from_dir
+from oxenfree.bin.merge_jsons import Args, main
+
+
+def _entry(tag: str, ru_machine: str = '') -> TranslationEntry:
+    return TranslationEntry(tag=tag, en=f'en {tag}', ru_native='', ru_machine=ru_machine,
+                            ru_final='', verified=False, uk='')
+
+
+def _save(folder: Path, scene: str, entries: List[TranslationEntry], bundle: str = 'loc_packages_assets_') -> Path:
+    folder.mkdir(exist_ok=True)
+    TranslationScene(bundle=bundle, scene=scene, entries=entries).save_to_file(folder)
+    return folder
+
+
+def test_inputs_override_base(tmp_path: Path) -> None:
+    base = _save(tmp_path / 'base', 'A1JC', [_entry('A1JC_0'), _entry('A1JC_1'), _entry('A1JC_2')])
+    _save(base, 'A2W2', [_entry('A2W2_0')], bundle='dialogue_packages_assets_all')
+    shard_0 = _save(tmp_path / 'shard_0', 'A1JC', [_entry('A1JC_1', 'D/ one'), _entry('A1JC_3', 'D/ new')])
+    shard_1 = _save(tmp_path / 'shard_1', 'A1JC', [_entry('A1JC_0', 'D/ zero')])
+
+    main(Args(False, [shard_0, shard_1], base, tmp_path / 'output', False))
+
+    merged = load_translation_map_from_dir(tmp_path / 'output')
+    assert sorted(merged) == ['A1JC', 'A2W2']
+    assert [(e.tag, e.ru_machine) for e in merged['A1JC'].entries] == [
+        ('A1JC_0', 'D/ zero'),
+        ('A1JC_1', 'D/ one'),
+        ('A1JC_2', ''),
+        ('A1JC_3', 'D/ new'),
+    ]
+    assert merged['A2W2'].entries == [_entry('A2W2_0')]
+
+
+def test_conflicts_between_inputs(tmp_path: Path) -> None:
+    base = _save(tmp_path / 'base', 'A1JC', [_entry('A1JC_0')])
+    shard_0 = _save(tmp_path / 'shard_0', 'A1JC', [_entry('A1JC_0', 'D/ zero')])
+    shard_1 = _save(tmp_path / 'shard_1', 'A1JC', [_entry('A1JC_0', 'D/ other')])
+
+    with pytest.raises(RuntimeError):
+        main(Args(False, [shard_0, shard_1], base, tmp_path / 'output', False))
+
+    main(Args(False, [shard_0, shard_1], base, tmp_path / 'output', True))
+    merged = load_translation_map_from_dir(tmp_path / 'output')
+    assert merged['A1JC'].entries == [_entry('A1JC_0', 'D/ zero')]
@@ -0,0 +1,64 @@
+import gzip
+import logging
+import shutil
+
+from pathlib import Path
+
+import pytest
+
+from oxenfree.bin.prepare_jsons import get_entries_from_csvs
+
+
+def _write_table(path: Path, rows: int, prefix: str = '') -> None:
+    with path.open('w', encoding='utf-8', newline='') as f:
+        # no csv.writer here: stray quotes must stay unescaped, like in Google Sheets exports
+        f.write('tag\tbundle\ten\tru\tuk\n')
+        for idx in range(rows):
+            if idx % 97 == 0:
+                en = 'bad " quote'
+            elif idx % 89 == 0:
+                en = '"multi\nline ""quoted"" text"'
+            else:
+                en = f'{prefix}line {idx}'
+            f.write(f'A1JC.SCENE_RILEY_{idx:06}\tloc_packages_assets_\t{en}\tru {idx}\tuk {idx}\n')
+
+
+def test_quotes(tmp_path: Path) -> None:
+    table = tmp_path / 'table.csv'
+    _write_table(table, 200)
+
+    entries = get_entries_from_csvs([table], 'bundle')
+
+    assert len(entries) == 200
+    assert entries['A1JC.SCENE_RILEY_000097'].en == 'bad " quote'
+    assert entries['A1JC.SCENE_RILEY_000098'].en == 'line 98'
+    assert entries['A1JC.SCENE_RILEY_000089'].en == 'multi\nline "quoted" text'
+    assert entries['A1JC.SCENE_RILEY_000090'].en == 'line 90'
+
+
+def test_gzip_reads_like_plain(tmp_path: Path) -> None:
+    table = tmp_path / 'table.csv'
+    _write_table(table, 200)
+    compressed = tmp_path / 'table.csv.gz'
+    with table.open('rb') as src, gzip.open(compressed, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+
+    assert get_entries_from_csvs([compressed], 'bundle') == get_entries_from_csvs([table], 'bundle')
+
+
+def test_last_entry_wins(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    first = tmp_path / 'first.csv'
+    second = tmp_path / 'second.csv'
+    _write_table(first, 10)
+    _write_table(second, 5, prefix='new ')
+
+    with caplog.at_level(logging.WARNING):
+        entries = get_entries_from_csvs([first, second], 'bundle')
+
+    assert len(entries) == 10
+    assert entries['A1JC.SCENE_RILEY_000001'].en == 'new line 1'
+    assert entries['A1JC.SCENE_RILEY_000009'].en == 'line 9'
+    assert caplog.messages == [
+        f'csv: {second} contains entry for A1JC.SCENE_RILEY_{idx:06} that was already read'
+        for idx in range(5)
+    ]
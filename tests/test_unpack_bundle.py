@@ -0,0 +1,96 @@
+import gzip
+import logging
+import random
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+import oxenfree.bin.unpack_bundle as unpack_bundle
+from oxenfree.text_table import load_text_columns
+
+Tree = Tuple[str, Dict[str, Any]]
+
+
+def _tree(bundle: str, name: str, lang: str, entries: List[Tuple[str, str]]) -> Tree:
+    return bundle, {
+        'm_Name': name,
+        '_ietfTag': lang,
+        '_database': {'_entries': [{'_entryName': t, '_localization': x} for t, x in entries]},
+    }
+
+
+def _random_trees(seed: int) -> List[Tree]:
+    '''texts repeat across objects, and some ru/uk/de objects come before any en one'''
+    r = random.Random(seed)
+    tags = [f'A1JC.SCENE_{idx:03}' for idx in range(40)]
+    result = []
+    for idx in range(12):
+        lang = r.choice(['en', 'ru', 'uk', 'de', 'zh-Hans'])
+        entries = [(tag, f'{lang} {r.randint(0, 9)}') for tag in r.sample(tags, r.randint(1, 20))]
+        result.append(_tree(r.choice(['loc_packages_assets_', 'dialogue_packages_assets_all']),
+                            f'object{idx}', lang, entries))
+    return result
+
+
+@pytest.fixture
+def trees(monkeypatch: pytest.MonkeyPatch) -> List[Tree]:
+    result: List[Tree] = []
+    monkeypatch.setattr(unpack_bundle, 'iter_text_trees', lambda bundles: iter(result))
+    return result
+
+
+def _read_table(output_dir: Path, compress: bool) -> bytes:
+    if compress:
+        with gzip.open(output_dir / 'text_table.csv.gz', 'rb') as f:
+            return f.read()
+    return (output_dir / 'text_table.csv').read_bytes()
+
+
+@pytest.mark.parametrize('compress', [False, True])
+@pytest.mark.parametrize('all_languages', [False, True])
+def test_stream_matches_in_memory(
+        tmp_path: Path, trees: List[Tree], compress: bool, all_languages: bool
+    ) -> None:
+    for seed in range(50):
+        trees[:] = _random_trees(seed)
+        unpack_bundle.dump_text_map(unpack_bundle.upy_unpack_bundles({}), tmp_path / 'memory')
+        unpack_bundle.stream_bundles({}, tmp_path / 'stream', all_languages, compress)
+
+        expected = (tmp_path / 'memory' / 'text_table.csv').read_bytes()
+        assert _read_table(tmp_path / 'stream', compress) == expected, f'seed {seed}'
+
+
+def test_all_languages_sqlite(tmp_path: Path, trees: List[Tree]) -> None:
+    trees[:] = [
+        _tree('loc_packages_assets_', 'en', 'en', [('a', 'A'), ('b', 'B')]),
+        _tree('loc_packages_assets_', 'de', 'de', [('a', 'A de'), ('c', 'C de')]),
+        _tree('dialogue_packages_assets_all', 'ru', 'ru', [('b', 'B ru')]),
+    ]
+    unpack_bundle.stream_bundles({}, tmp_path, True, False)
+
+    columns = load_text_columns(tmp_path / 'text_table.sqlite')
+    assert columns.tags == ['a', 'b', 'c']
+    assert columns.bundles == ['loc_packages_assets_', 'dialogue_packages_assets_all', 'loc_packages_assets_']
+    assert columns.languages == {
+        'de': ['A de', None, 'C de'],
+        'en': ['A', 'B', None],
+        'ru': [None, 'B ru', None],
+    }
+    assert load_text_columns(tmp_path / 'text_table.sqlite', ['ru']).languages == {'ru': [None, 'B ru', None]}
+
+
+def test_repeated_texts_reported_once(
+        tmp_path: Path, trees: List[Tree], caplog: pytest.LogCaptureFixture
+    ) -> None:
+    trees[:] = [
+        _tree('loc_packages_assets_', 'en', 'en', [('a', 'A')]),
+        _tree('loc_packages_assets_', 'en2', 'en', [('a', 'A2')]),
+        _tree('loc_packages_assets_', 'de', 'de', [('a', 'A de')]),
+        _tree('loc_packages_assets_', 'de2', 'de', [('a', 'A de2')]),
+    ]
+    with caplog.at_level(logging.WARNING):
+        unpack_bundle.stream_bundles({}, tmp_path, True, False)
+
+    assert caplog.messages == ['fill: a-en already exists!!', 'fill: a-de already exists!!']